@@ -1,16 +1,38 @@
 import cv2
 import numpy as np
 import base64
-import gc
+import glob
+import sys
 import threading
 import time
-from PyQt6.QtWidgets import (QWidget, QLabel, QVBoxLayout)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QObject, QPoint
-from PyQt6.QtGui import QImage, QPixmap, QPainter, QRegion, QPolygon
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QObject, QPoint, QMutex
+from PyQt6.QtGui import QImage, QPainter, QRegion, QPolygon, QColor
+from PyQt6 import sip
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420, TJPF_BGR
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# OpenCV is only used here for small preview/analysis frames, where its worker
+# fan-out costs more than the work itself. cv2.setNumThreads only affects
+# OpenCV's own pool; OMP_NUM_THREADS is deliberately left alone because it
+# would also throttle Whisper/torch running in the same process.
+cv2.setNumThreads(1)
+
+
+def dhash(frame):
+    """64-bit difference hash of a BGR frame: one bit per horizontal brightness step on a 9x8 thumbnail"""
+    small = cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = gray[:, 1:] > gray[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
 
 
 class CameraOverlayThread(QThread):
-    frame_ready = pyqtSignal(np.ndarray)
     error_occurred = pyqtSignal(str)
     
     def __init__(self):
@@ -18,11 +40,28 @@ class CameraOverlayThread(QThread):
         self.running = False
         self.cap = None
         self.camera_index = 0
-        self.frame_skip_counter = 0
-        self.frame_skip_rate = 2
+        self.gui_frame_rate = 10
+        self.target_size = (320, 240)
+        self.frame_size = None
+        self.grayscale = False
+        self.raw_yuyv = False
         
-    def start_camera(self, camera_index=0):
+        # Frames are published through a double buffer instead of a signal:
+        # the thread fills _buffers[_write_idx], then flips the index so the
+        # other slot always holds the newest complete frame. Until the first
+        # flip neither slot has been filled, so nothing is published.
+        self._buffers = [None, None]
+        self._write_idx = 0
+        self._published = False
+        self._swap_lock = QMutex()
+        self.frame_available = threading.Event()
+        
+    def start_camera(self, camera_index=0, target_size=None, grayscale=False):
         self.camera_index = camera_index
+        if target_size:
+            self.target_size = target_size
+        self.grayscale = grayscale
+        self._published = False
         self.running = True
         self.start()
         
@@ -32,13 +71,61 @@ class CameraOverlayThread(QThread):
             self.cap.release()
         self.wait()
         
+    def latest_frame(self):
+        """Return the most recently published frame buffer (owned by the thread), or None before the first frame"""
+        if not self._published:
+            return None
+        return self._buffers[self._write_idx ^ 1]
+        
+    def copy_latest_frame(self, dst=None):
+        """Copy the most recently published frame into dst (reallocated if the shape changed)"""
+        self._swap_lock.lock()
+        try:
+            frame = self.latest_frame()
+            if frame is None:
+                return None
+            if dst is None or dst.shape != frame.shape:
+                dst = np.empty_like(frame)
+            dst[...] = frame
+            return dst
+        finally:
+            self._swap_lock.unlock()
+        
+    def _camera_candidates(self):
+        """Return (indices, backend) for the camera devices present on this platform"""
+        if sys.platform.startswith("linux"):
+            backend = cv2.CAP_V4L2
+            indices = sorted(
+                int(path[len("/dev/video"):])
+                for path in glob.glob("/dev/video*")
+                if path[len("/dev/video"):].isdigit()
+            )
+        elif sys.platform == "win32":
+            backend = cv2.CAP_MSMF
+            indices = list(range(10))
+        elif sys.platform == "darwin":
+            backend = cv2.CAP_AVFOUNDATION
+            indices = list(range(10))
+        else:
+            backend = cv2.CAP_ANY
+            indices = list(range(10))
+            
+        if backend != cv2.CAP_ANY and backend not in cv2.videoio_registry.getCameraBackends():
+            backend = cv2.CAP_ANY
+            
+        if self.camera_index in indices:
+            indices.remove(self.camera_index)
+        return [self.camera_index] + indices, backend
+        
     def run(self):
         try:
-            indices_to_try = [self.camera_index] + [i for i in range(10) if i != self.camera_index]
+            indices_to_try, backend = self._camera_candidates()
             self.cap = None
             
             for idx in indices_to_try:
-                test_cap = cv2.VideoCapture(idx)
+                # No open params: the camera backends (V4L2, MSMF, AVFoundation)
+                # reject CAP_PROP_OPEN_TIMEOUT_MSEC and fail the whole open
+                test_cap = cv2.VideoCapture(idx, backend)
                 if test_cap.isOpened():
                     ret, _ = test_cap.read()
                     if ret:
@@ -55,22 +142,64 @@ class CameraOverlayThread(QThread):
                 self.error_occurred.emit("Could not open any camera device")
                 return
                 
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+            # Let the driver scale to the analysis size and hand back MJPG
+            # rather than converting raw frames in software. A grayscale
+            # preview asks for raw YUYV instead so the Y plane can be shown as-is.
+            # The preview is resized from this frame; capturing at the preview
+            # size would also shrink what the vision model sees.
+            target_width, target_height = self.target_size
+            if self.grayscale:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('Y', 'U', 'Y', 'V'))
+                self.raw_yuyv = bool(self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+            else:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'))
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, target_width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, target_height)
             self.cap.set(cv2.CAP_PROP_FPS, 15)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.frame_size = (
+                int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            )
+            
+            if not self.raw_yuyv:
+                width, height = self.frame_size
+                self._buffers = [
+                    np.empty((height, width, 3), np.uint8),
+                    np.empty((height, width, 3), np.uint8)
+                ]
+            
+            target_dt = 1.0 / self.gui_frame_rate
+            next_deadline = time.monotonic()
             
+            # grab() blocks until the driver has a frame, so no sleep is needed.
+            # Frames before the deadline are grabbed and dropped without being
+            # decoded; only the frame that is actually shown gets retrieved.
             while self.running and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret:
-                    self.frame_skip_counter += 1
-                    if self.frame_skip_counter >= self.frame_skip_rate:
-                        self.frame_skip_counter = 0
-                        self.frame_ready.emit(frame)
-                else:
+                if not self.cap.grab():
+                    self.error_occurred.emit("Failed to read frame from camera")
+                    break
+                    
+                now = time.monotonic()
+                if now < next_deadline:
+                    continue
+                next_deadline += target_dt
+                if next_deadline < now:
+                    next_deadline = now + target_dt
+                    
+                # retrieve() decodes into the write buffer in place; it only hands
+                # back a new array if the buffer's shape doesn't match
+                ret, frame = self.cap.retrieve(self._buffers[self._write_idx])
+                if not ret:
                     self.error_occurred.emit("Failed to read frame from camera")
                     break
+                self._buffers[self._write_idx] = frame
                     
-                time.sleep(0.01)
+                self._swap_lock.lock()
+                self._write_idx ^= 1
+                self._published = True
+                self._swap_lock.unlock()
+                self.frame_available.set()
                     
         except Exception as e:
             self.error_occurred.emit(f"Camera error: {str(e)}")
@@ -79,6 +208,57 @@ class CameraOverlayThread(QThread):
                 self.cap.release()
 
 
+class CameraPane(QWidget):
+    """Camera preview cell that paints a shared QImage directly"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.image = None
+        self.text = "📷"
+        self.error = False
+        
+    def set_image(self, image):
+        """Point the pane at a (long-lived) QImage; pixels are read at paint time"""
+        self.image = image
+        self.text = None
+        self.error = False
+        
+    def show_error(self):
+        self.error = True
+        self.image = None
+        self.text = "❌"
+        self.update()
+        
+    def image_rect(self):
+        """Rect the preview image occupies, centered in the pane"""
+        if self.image is None:
+            return self.rect()
+        x = (self.width() - self.image.width()) // 2
+        y = (self.height() - self.image.height()) // 2
+        return self.image.rect().translated(x, y)
+        
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.error:
+            background = QColor(68, 0, 0, 180)
+            border = QColor("#FF4444")
+        else:
+            background = QColor(0, 34, 34, 180)
+            border = QColor("#00FFFF")
+            
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(background)
+        painter.setPen(border)
+        painter.drawRoundedRect(self.rect().adjusted(0, 0, -1, -1), 4, 4)
+        
+        if self.image is not None:
+            painter.drawImage(self.image_rect().topLeft(), self.image)
+        elif self.text:
+            if not self.error:
+                painter.setPen(self.palette().windowText().color())
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text)
+
+
 class FShapedOverlay(QWidget):
     """F-shaped camera overlay window"""
     
@@ -103,120 +283,204 @@ class FShapedOverlay(QWidget):
         
         self.setup_ui()
         self.camera_thread = CameraOverlayThread()
-        self.camera_thread.frame_ready.connect(self.update_frame)
         self.camera_thread.error_occurred.connect(self.show_error)
         
-        self.current_frame = None
         self.frame_buffer = None
-        self.last_frame_time = 0
         self.frame_rate_limit = 10
+        self.grayscale_preview = False
+        
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self._poll_frame)
+        
+        # JPEG encoding for analysis runs off the GUI thread
+        self._encoder = ThreadPoolExecutor(max_workers=1)
+        self._encode_scratch = None
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+            except Exception:
+                self._tj = None
+        
+        # Preview buffers are allocated once and Qt reads their pixels through raw
+        # pointers; the ndarrays stay referenced on self to keep the memory alive
+        self.preview_width = self.vertical_width - 10
+        self.preview_height = self.vertical_height - 20
+        self.analysis_size = (320, 240)
+        # Colour frames are widened to 32bpp BGRA (ARGB32 in little-endian memory
+        # order), the backing-store format Qt composites without converting
+        self._small_bgr = np.empty((self.preview_height, self.preview_width, 3), np.uint8)
+        self._small_argb = np.empty((self.preview_height, self.preview_width, 4), np.uint8)
+        self._small_argb[..., 3] = 255
+        self._argb_ptr = sip.voidptr(self._small_argb.ctypes.data, self._small_argb.nbytes, True)
+        self._qimage = QImage(
+            self._argb_ptr,
+            self.preview_width,
+            self.preview_height,
+            4 * self.preview_width,
+            QImage.Format.Format_ARGB32_Premultiplied
+        )
+        self._small_gray = np.empty((self.preview_height, self.preview_width), np.uint8)
+        self._gray_ptr = sip.voidptr(self._small_gray.ctypes.data, self._small_gray.nbytes, True)
+        self._qimage_gray = QImage(
+            self._gray_ptr,
+            self.preview_width,
+            self.preview_height,
+            self.preview_width,
+            QImage.Format.Format_Grayscale8
+        )
         
     def setup_ui(self):
         """Setup the overlay UI with F-shaped layout"""
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
         
-        self.camera_labels = []
-        
-        self.vertical_label = QLabel()
-        self.vertical_label.setFixedSize(self.vertical_width, self.vertical_height)
-        self.vertical_label.setStyleSheet("""
-            QLabel {
+        self.setStyleSheet("""
+            QLabel#overlayCell {
                 background-color: rgba(0, 34, 34, 180);
                 border: 1px solid #00FFFF;
                 border-radius: 4px;
             }
         """)
-        self.vertical_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.vertical_label.setText("📷")
         
-        self.top_horizontal_label = QLabel()
+        self.camera_labels = []
+        
+        self.camera_pane = CameraPane(self)
+        self.camera_pane.setFixedSize(self.vertical_width, self.vertical_height)
+        
+        self.top_horizontal_label = QLabel(self)
         self.top_horizontal_label.setFixedSize(self.horizontal_width, self.horizontal_height)
-        self.top_horizontal_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(0, 34, 34, 180);
-                border: 1px solid #00FFFF;
-                border-radius: 4px;
-            }
-        """)
+        self.top_horizontal_label.setObjectName("overlayCell")
         self.top_horizontal_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.top_horizontal_label.setText("VISION")
         
-        self.middle_horizontal_label = QLabel()
+        self.middle_horizontal_label = QLabel(self)
         self.middle_horizontal_label.setFixedSize(self.horizontal_width - 20, self.horizontal_height)
-        self.middle_horizontal_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(0, 34, 34, 180);
-                border: 1px solid #00FFFF;
-                border-radius: 4px;
-            }
-        """)
+        self.middle_horizontal_label.setObjectName("overlayCell")
         self.middle_horizontal_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.middle_horizontal_label.setText("ACTIVE")
         
-        self.vertical_label.move(5, 5)
+        self.camera_pane.move(5, 5)
         self.top_horizontal_label.move(self.vertical_width - 10, 5)
         self.middle_horizontal_label.move(self.vertical_width - 10, 60)
         
     def start_camera(self, camera_index=0):
-        self.camera_thread.start_camera(camera_index)
+        self.camera_thread.gui_frame_rate = self.frame_rate_limit
+        self.camera_thread.start_camera(
+            camera_index,
+            target_size=self.analysis_size,
+            grayscale=self.grayscale_preview
+        )
+        self.frame_timer.start(1000 // self.frame_rate_limit)
+        
+    def _poll_frame(self):
+        """Pull the newest frame from the capture thread, if one was published"""
+        if not self.camera_thread.frame_available.is_set():
+            return
+        self.camera_thread.frame_available.clear()
+        frame = self.camera_thread.latest_frame()
+        if frame is not None:
+            self.update_frame(frame)
         
     def update_frame(self, frame):
         """Update camera frame with RAM optimization"""
         try:
-            current_time = time.time()
-            
-            if current_time - self.last_frame_time < (1.0 / self.frame_rate_limit):
-                return
-            self.last_frame_time = current_time
-            
-            self.current_frame = frame
-            
-            small_frame = cv2.resize(frame, (self.vertical_width - 10, self.vertical_height - 20))
-            rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-            
-            height, width, channels = rgb_frame.shape
-            bytes_per_line = channels * width
-            
-            qt_image = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_image)
-            
-            self.vertical_label.setPixmap(pixmap)
+            if self.camera_thread.raw_yuyv:
+                # YUYV interleaves luma with chroma, so every other byte is Y
+                width, height = self.camera_thread.frame_size
+                luma = frame.reshape(height, width, 2)[..., 0]
+                cv2.resize(
+                    luma,
+                    (self.preview_width, self.preview_height),
+                    dst=self._small_gray,
+                    interpolation=cv2.INTER_AREA
+                )
+                image = self._qimage_gray
+            else:
+                cv2.resize(
+                    frame,
+                    (self.preview_width, self.preview_height),
+                    dst=self._small_bgr,
+                    interpolation=cv2.INTER_AREA
+                )
+                cv2.cvtColor(self._small_bgr, cv2.COLOR_BGR2BGRA, dst=self._small_argb)
+                image = self._qimage
             
-            if int(current_time) % 5 == 0:
-                gc.collect()
+            # The pane paints straight from the QImage backing buffer, so only
+            # the image rect needs repainting
+            if self.camera_pane.image is not image:
+                self.camera_pane.set_image(image)
+                self.camera_pane.update()
+            else:
+                self.camera_pane.update(self.camera_pane.image_rect())
                 
         except Exception as e:
             self.show_error(f"Frame processing error: {str(e)}")
             
     def show_error(self, error_msg):
         """Show error in overlay"""
-        self.vertical_label.setText("❌")
-        self.vertical_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(68, 0, 0, 180);
-                border: 1px solid #FF4444;
-                border-radius: 4px;
-                color: #FF4444;
-            }
-        """)
+        self.camera_pane.show_error()
+        
+    def capture_frame_jpeg_bytes(self):
+        """Capture the latest frame and return a Future resolving to raw JPEG bytes"""
+        return self._encoder.submit(self._encode_latest_frame)
         
     def capture_frame_for_analysis(self):
-        """Capture current frame and return it as base64 for LLM analysis"""
+        """Capture the latest frame and return a Future resolving to base64 for LLM analysis"""
+        return self._encoder.submit(self._encode_latest_frame_base64)
+        
+    def capture_frame_with_hash(self):
+        """Capture the latest frame and return a Future resolving to (JPEG bytes, dHash)"""
+        return self._encoder.submit(self._encode_latest_frame_with_hash)
+        
+    def _latest_bgr_frame(self):
+        """Copy the latest camera frame as BGR (runs on the encoder thread)"""
+        frame = self.camera_thread.copy_latest_frame(self._encode_scratch)
+        if frame is None:
+            return None
+        self._encode_scratch = frame
+        
+        if self.camera_thread.raw_yuyv:
+            width, height = self.camera_thread.frame_size
+            frame = cv2.cvtColor(frame.reshape(height, width, 2), cv2.COLOR_YUV2BGR_YUYV)
+        return frame
+        
+    def _encode_jpeg(self, frame):
+        if self._tj is not None:
+            return self._tj.encode(
+                frame, quality=70, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420
+            )
+        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 70]
+        _, buffer = cv2.imencode('.jpg', frame, encode_param)
+        return buffer.tobytes()
+        
+    def _encode_latest_frame(self):
+        """Encode the latest camera frame as JPEG bytes (runs on the encoder thread)"""
         try:
-            if self.current_frame is not None:
-                encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 70]
-                _, buffer = cv2.imencode('.jpg', self.current_frame, encode_param)
-                base64_image = base64.b64encode(buffer).decode('utf-8')
-                
-                buffer = None
-                return base64_image
-            else:
+            frame = self._latest_bgr_frame()
+            if frame is None:
                 return None
+            return self._encode_jpeg(frame)
         except Exception:
-            pass
             return None
             
+    def _encode_latest_frame_with_hash(self):
+        """Encode the latest camera frame and hash the same frame (runs on the encoder thread)"""
+        try:
+            frame = self._latest_bgr_frame()
+            if frame is None:
+                return None
+            return self._encode_jpeg(frame), dhash(frame)
+        except Exception:
+            return None
+            
+    def _encode_latest_frame_base64(self):
+        """Encode the latest camera frame as base64 JPEG (runs on the encoder thread)"""
+        jpeg_bytes = self._encode_latest_frame()
+        if jpeg_bytes is None:
+            return None
+        return base64.b64encode(jpeg_bytes).decode('ascii')
+            
     def position_near_window(self, main_window):
         """Position the overlay near the main window's top-left corner"""
         if main_window:
@@ -236,7 +500,9 @@ class FShapedOverlay(QWidget):
             self.move(overlay_x, overlay_y)
             
     def closeEvent(self, event):
+        self.frame_timer.stop()
         self.camera_thread.stop_camera()
+        self._encoder.shutdown(wait=False)
         event.accept()
 
 
@@ -251,6 +517,8 @@ class CameraOverlayManager(QObject):
         super().__init__()
         self.overlay = None
         self.main_window = None
+        self._app = QApplication.instance()
+        self._main_thread = self._app.thread() if self._app else None
         
         self.open_overlay_signal.connect(self._open_overlay_slot)
         self.close_overlay_signal.connect(self._close_overlay_slot)
@@ -259,17 +527,10 @@ class CameraOverlayManager(QObject):
     def open_overlay(self, parent=None):
         """Open the camera overlay - thread-safe version"""
         try:
-            from PyQt6.QtWidgets import QApplication
-            from PyQt6.QtCore import QThread
-            
-            app = QApplication.instance()
-            if app is None:
+            if self._app is None:
                 return "Cannot open overlay: GUI not initialized"
                 
-            current_thread = QThread.currentThread()
-            main_thread = app.thread()
-            
-            if current_thread != main_thread:
+            if QThread.currentThread() != self._main_thread:
                 self.open_overlay_signal.emit(parent)
                 return "Overlay opening request sent"
             else:
@@ -305,17 +566,10 @@ class CameraOverlayManager(QObject):
     def close_overlay(self):
         """Close the camera overlay - thread-safe version"""
         try:
-            from PyQt6.QtWidgets import QApplication
-            from PyQt6.QtCore import QThread
-            
-            app = QApplication.instance()
-            if app is None:
+            if self._app is None:
                 return "Cannot close overlay: GUI not initialized"
                 
-            current_thread = QThread.currentThread()
-            main_thread = app.thread()
-            
-            if current_thread != main_thread:
+            if QThread.currentThread() != self._main_thread:
                 self.close_overlay_signal.emit()
                 return "Overlay close request sent"
             else:
@@ -343,17 +597,10 @@ class CameraOverlayManager(QObject):
     def position_overlay(self, main_window):
         """Position overlay near main window - thread-safe version"""
         try:
-            from PyQt6.QtWidgets import QApplication
-            from PyQt6.QtCore import QThread
-            
-            app = QApplication.instance()
-            if app is None:
+            if self._app is None:
                 return
                 
-            current_thread = QThread.currentThread()
-            main_thread = app.thread()
-            
-            if current_thread != main_thread:
+            if QThread.currentThread() != self._main_thread:
                 self.position_overlay_signal.emit(main_window)
             else:
                 self._position_overlay_direct(main_window)
@@ -386,13 +633,24 @@ class CameraOverlayManager(QObject):
         """Alias for close_overlay for backward compatibility"""
         return self.close_overlay()
     
-    def capture_and_analyze_frame(self, vision_prompt="What do you see in this image?"):
-        """Capture current frame and return it for analysis"""
+    def capture_frame_async(self, format="base64", with_hash=False):
+        """Start encoding the current frame and return a Future, or None if the overlay is closed
+        
+        With with_hash the Future resolves to (JPEG bytes, 64-bit dHash) instead.
+        """
+        if self.overlay and self.overlay.isVisible():
+            if with_hash:
+                return self.overlay.capture_frame_with_hash()
+            if format == "bytes":
+                return self.overlay.capture_frame_jpeg_bytes()
+            return self.overlay.capture_frame_for_analysis()
+        return None
+    
+    def capture_and_analyze_frame(self, vision_prompt="What do you see in this image?", format="base64"):
+        """Capture current frame and return it for analysis, as a base64 string or raw JPEG bytes"""
         try:
-            if self.overlay and self.overlay.isVisible():
-                return self.overlay.capture_frame_for_analysis()
-            else:
-                return None
+            future = self.capture_frame_async(format)
+            return future.result() if future is not None else None
         except Exception:
             pass
             return None
\ No newline at end of file
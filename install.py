@@ -1,23 +1,76 @@
 #!/usr/bin/env python3
 
 import os
+import io
 import sys
 import subprocess
 import platform
 import urllib.request
 import shutil
 import json
+import hashlib
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 
 
+class ThreadOutput:
+    """stdout proxy that lets worker threads buffer their output instead of interleaving it"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        return buffer
+
+    def is_capturing(self):
+        return getattr(self._local, "buffer", None) is not None
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
 class RavenInstaller:
     def __init__(self):
         self.system = platform.system()
         self.python_version = sys.version_info
         self.project_root = Path(__file__).parent.absolute()
         self.models_dir = self.project_root / "models"
+        self.manifest_path = self.models_dir / "manifest.json"
         self.venv_dir = self.project_root / "venv"
+        self.pip_check_file = self.venv_dir / ".pip_version_check"
+        self.pip_check_max_age = 7 * 24 * 3600
         self.required_models = ["llama3.1:8b", "qwen2.5vl:7b"]
+        self.ollama_host = "127.0.0.1"
+        self.ollama_port = 11434
+        self._available_models = None
+        self._pull_progress = {}
+        self._progress_lock = threading.Lock()
+        self._last_render = 0.0
+        self._progress_width = 0
+
+    @cached_property
+    def _ollama_bin(self):
+        return shutil.which("ollama")
+
+    @cached_property
+    def _apt_get_bin(self):
+        return shutil.which("apt-get")
 
     def print_step(self, message):
         print(f"\n{'='*60}")
@@ -59,19 +112,17 @@ class RavenInstaller:
             print("  Fedora: sudo dnf install portaudio-devel python3-devel")
             print("  Arch: sudo pacman -S portaudio python")
             try:
-                result = subprocess.run(
-                    ["which", "apt-get"],
-                    capture_output=True
-                )
-                if result.returncode == 0:
+                if self._apt_get_bin:
                     print("\nAttempting to install dependencies via apt-get...")
                     try:
-                        subprocess.run(["sudo", "apt-get", "update"], check=True, capture_output=True, timeout=60)
+                        # One sudo session for both steps; output streams straight to the terminal
                         subprocess.run(
-                            ["sudo", "apt-get", "install", "-y", "python3-venv", "python3-pip", "portaudio19-dev", "python3-dev"],
+                            [
+                                "sudo", "sh", "-c",
+                                "apt-get update && apt-get install -y python3-venv python3-pip portaudio19-dev python3-dev"
+                            ],
                             check=True,
-                            capture_output=True,
-                            timeout=300
+                            timeout=360
                         )
                         self.print_success("System dependencies installed")
                     except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
@@ -99,11 +150,40 @@ class RavenInstaller:
             self.print_error(f"Failed to create virtual environment: {e}")
             return False
 
+    def run_logged(self, cmd, check=False, **kwargs):
+        """Run a command, routing its output through sys.stdout when this thread's output is buffered"""
+        if not (isinstance(sys.stdout, ThreadOutput) and sys.stdout.is_capturing()):
+            return subprocess.run(cmd, check=check, **kwargs)
+
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            **kwargs
+        )
+        sys.stdout.write(result.stdout or "")
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=result.stdout)
+        return result
+
     def get_pip_command(self):
+        # python -m pip skips the pip shim script and its re-exec
+        return [self.get_python_command(), "-m", "pip"]
+
+    def get_pip_script(self):
         if self.system == "Windows":
-            return str(self.venv_dir / "Scripts" / "pip.exe")
+            return self.venv_dir / "Scripts" / "pip.exe"
         else:
-            return str(self.venv_dir / "bin" / "pip")
+            return self.venv_dir / "bin" / "pip"
+
+    @cached_property
+    def pip_env(self):
+        """Environment for pip runs: no self-update check against PyPI, never prompt"""
+        env = os.environ.copy()
+        env["PIP_DISABLE_PIP_VERSION_CHECK"] = "1"
+        env["PIP_NO_INPUT"] = "1"
+        return env
 
     def get_python_command(self):
         if self.system == "Windows":
@@ -111,60 +191,212 @@ class RavenInstaller:
         else:
             return str(self.venv_dir / "bin" / "python")
 
+    def installed_pip_version(self):
+        """Read pip's version from its dist-info in the venv, without starting an interpreter"""
+        for dist_info in self.venv_dir.glob("[Ll]ib/**/site-packages/pip-*.dist-info"):
+            return dist_info.name[len("pip-"):-len(".dist-info")]
+        return None
+
+    def pip_recently_upgraded(self):
+        try:
+            stamp = self.pip_check_file.stat()
+            recorded = self.pip_check_file.read_text().strip()
+        except OSError:
+            return False
+        fresh = time.time() - stamp.st_mtime < self.pip_check_max_age
+        return fresh and recorded == self.installed_pip_version()
+
+    def record_pip_upgrade(self):
+        version = self.installed_pip_version()
+        if version:
+            self.pip_check_file.write_text(version)
+
     def install_requirements(self):
         self.print_step("Installing Python Requirements")
         pip_cmd = self.get_pip_command()
 
-        print("Upgrading pip...")
-        try:
-            subprocess.run(
-                [pip_cmd, "install", "--upgrade", "pip"],
-                check=True,
-                capture_output=True,
-            )
-            self.print_success("Pip upgraded")
-        except subprocess.CalledProcessError:
-            self.print_warning("Could not upgrade pip (continuing anyway)")
-
-        requirements_file = self.project_root / "requirements.txt"
-        if requirements_file.exists():
-            print("Installing from requirements.txt...")
+        if self.pip_recently_upgraded():
+            print("pip was upgraded within the last week, skipping upgrade")
+        else:
+            print("Upgrading pip...")
             try:
-                result = subprocess.run(
-                    [pip_cmd, "install", "-r", str(requirements_file)],
+                subprocess.run(
+                    [*pip_cmd, "install", "--upgrade", "pip"],
                     check=True,
-                    capture_output=False,
+                    capture_output=True,
+                    env=self.pip_env,
                 )
-                self.print_success("Requirements installed")
-                return True
-            except subprocess.CalledProcessError as e:
-                self.print_error(f"Failed to install requirements: {e}")
-                print("\nTroubleshooting:")
-                print("1. Check internet connection")
-                print("2. Try: pip install --upgrade pip setuptools wheel")
-                print("3. For PyAudio on Linux: sudo apt-get install portaudio19-dev")
-                print("4. For PyAudio on macOS: brew install portaudio")
-                return False
+                self.record_pip_upgrade()
+                self.print_success("Pip upgraded")
+            except subprocess.CalledProcessError:
+                self.print_warning("Could not upgrade pip (continuing anyway)")
+
+        # A hash-pinned lock turns pip's resolver run into a flat download/install
+        lock_file = self.project_root / "requirements.lock.txt"
+        requirements_file = self.project_root / "requirements.txt"
+        if lock_file.exists():
+            print("Installing from requirements.lock.txt...")
+            install_cmd = [
+                *pip_cmd, "install", "--require-hashes", "--no-deps", "--prefer-binary",
+                "-r", str(lock_file)
+            ]
+        elif requirements_file.exists():
+            print("Installing from requirements.txt...")
+            install_cmd = [*pip_cmd, "install", "--prefer-binary", "-r", str(requirements_file)]
         else:
             self.print_error("requirements.txt not found")
             return False
 
+        try:
+            result = self.run_logged(install_cmd, check=True, env=self.pip_env)
+            self.print_success("Requirements installed")
+            return True
+        except subprocess.CalledProcessError as e:
+            self.print_error(f"Failed to install requirements: {e}")
+            print("\nTroubleshooting:")
+            print("1. Check internet connection")
+            print("2. Try: pip install --upgrade pip setuptools wheel")
+            print("3. For PyAudio on Linux: sudo apt-get install portaudio19-dev")
+            print("4. For PyAudio on macOS: brew install portaudio")
+            if lock_file.exists():
+                print("5. If the lock file is stale, delete requirements.lock.txt and re-run")
+            return False
+
+    def _sha256_file(self, path):
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            digest = hashlib.sha256()
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+            return digest.hexdigest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_model_cached(self, name, path):
+        """True if path exists and matches the SHA256 recorded for name in the models manifest"""
+        expected = self._load_manifest().get(name)
+        if not expected or not Path(path).is_file():
+            return False
+        return self._sha256_file(path) == expected
+
+    def record_model(self, name, path):
+        """Record the SHA256 of a downloaded model file in the models manifest"""
+        manifest = self._load_manifest()
+        manifest[name] = self._sha256_file(path)
+        with open(self.manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
     def download_whisper_model(self):
         self.print_step("Downloading Whisper Model")
         self.models_dir.mkdir(exist_ok=True)
         python_cmd = self.get_python_command()
 
+        # raven.py loads the CTranslate2 weights with faster-whisper; medium.pt
+        # is only fetched for venvs where faster-whisper did not install
+        faster_whisper_file = self.models_dir / "faster-whisper-medium" / "model.bin"
+        whisper_file = self.models_dir / "medium.pt"
+        if self.is_model_cached("faster-whisper-medium", faster_whisper_file):
+            self.print_success("Whisper model already downloaded")
+            return True
+
         download_script = """
-import whisper
+import hashlib
 import os
 import sys
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 models_dir = "models"
 os.makedirs(models_dir, exist_ok=True)
 
+try:
+    import faster_whisper
+except ImportError:
+    faster_whisper = None
+
+if faster_whisper is not None:
+    print("Downloading faster-whisper medium model...")
+    try:
+        faster_whisper.download_model(
+            "medium", output_dir=os.path.join(models_dir, "faster-whisper-medium")
+        )
+        print("✓ Whisper model downloaded successfully")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+import whisper
+
+url = whisper._MODELS["medium"]
+expected_sha256 = url.split("/")[-2]
+target = os.path.join(models_dir, os.path.basename(url))
+parts = 8
+
+
+def sha256_of(path):
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def content_length():
+    # A one-byte range request tells us both the size and whether ranges work
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        if response.status != 206:
+            return None
+        return int(response.headers["Content-Range"].rsplit("/", 1)[1])
+
+
+def fetch_range(start, end):
+    request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    with urllib.request.urlopen(request, timeout=60) as response, open(target, "r+b") as f:
+        f.seek(start)
+        while True:
+            block = response.read(1 << 20)
+            if not block:
+                break
+            f.write(block)
+
+
+def parallel_download():
+    size = content_length()
+    if not size:
+        return False
+    with open(target, "wb") as f:
+        f.truncate(size)
+    step = -(-size // parts)
+    ranges = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+    with ThreadPoolExecutor(max_workers=parts) as pool:
+        list(pool.map(lambda r: fetch_range(*r), ranges))
+    return sha256_of(target) == expected_sha256
+
+
 print("Downloading Whisper medium model...")
 try:
-    model = whisper.load_model("medium", download_root=models_dir)
+    if os.path.isfile(target) and sha256_of(target) == expected_sha256:
+        print("✓ Whisper model already present")
+        sys.exit(0)
+    try:
+        downloaded = parallel_download()
+    except Exception as e:
+        print(f"Parallel download failed ({e}), falling back to whisper's loader")
+        downloaded = False
+    if not downloaded:
+        if os.path.exists(target):
+            os.remove(target)
+        whisper.load_model("medium", download_root=models_dir)
     print("✓ Whisper model downloaded successfully")
     sys.exit(0)
 except Exception as e:
@@ -180,6 +412,10 @@ except Exception as e:
                 text=True,
             )
             if result.returncode == 0:
+                if faster_whisper_file.is_file():
+                    self.record_model("faster-whisper-medium", faster_whisper_file)
+                elif whisper_file.is_file():
+                    self.record_model("whisper-medium", whisper_file)
                 self.print_success("Whisper model downloaded")
                 return True
             else:
@@ -189,20 +425,37 @@ except Exception as e:
             self.print_error(f"Error downloading Whisper model: {e}")
             return False
 
-    def check_ollama_installed(self):
+    def download_token_encoding(self):
+        """Save tiktoken's cl100k_base file under models/ so raven.py never fetches it at startup"""
+        cache_dir = self.models_dir / "tiktoken"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if any(cache_dir.iterdir()):
+            self.print_success("Token encoding already downloaded")
+            return True
+
+        env = dict(os.environ, TIKTOKEN_CACHE_DIR=str(cache_dir))
         try:
             result = subprocess.run(
-                ["ollama", "--version"],
+                [self.get_python_command(), "-c", "import tiktoken; tiktoken.get_encoding('cl100k_base')"],
+                cwd=self.project_root,
+                env=env,
                 capture_output=True,
                 text=True,
-                timeout=5
+                timeout=120,
             )
             if result.returncode == 0:
-                version = result.stdout.strip()
-                self.print_success(f"Ollama found: {version}")
+                self.print_success("Token encoding downloaded")
                 return True
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+            self.print_error(f"Token encoding download failed: {result.stderr}")
+            return False
+        except Exception as e:
+            self.print_error(f"Error downloading token encoding: {e}")
+            return False
+
+    def check_ollama_installed(self):
+        if self._ollama_bin:
+            self.print_success(f"Ollama found: {self._ollama_bin}")
+            return True
         return False
 
     def install_ollama(self):
@@ -224,6 +477,7 @@ except Exception as e:
                 )
                 if result.returncode == 0:
                     self.print_success("Ollama installed")
+                    self.__dict__.pop("_ollama_bin", None)
                     subprocess.run(["sudo", "systemctl", "enable", "ollama"], capture_output=True)
                     subprocess.run(["sudo", "systemctl", "start", "ollama"], capture_output=True)
                     return True
@@ -248,6 +502,7 @@ except Exception as e:
                     )
                     if result.returncode == 0:
                         self.print_success("Ollama installed via Homebrew")
+                        self.__dict__.pop("_ollama_bin", None)
                         return True
                 print("\nManual installation:")
                 print("  brew install ollama")
@@ -266,55 +521,52 @@ except Exception as e:
             return False
 
     def check_ollama_running(self):
-        try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        return self.ollama_api_available()
 
     def start_ollama_service(self):
         if self.system == "Linux":
             try:
                 subprocess.run(["sudo", "systemctl", "start", "ollama"], check=True, capture_output=True)
-                import time
-                time.sleep(2)
-                return True
+                return self.wait_for_ollama()
             except:
                 pass
         elif self.system == "Darwin":
             try:
                 subprocess.Popen(["ollama", "serve"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                import time
-                time.sleep(2)
-                return True
+                return self.wait_for_ollama()
             except:
                 pass
         return False
 
+    def wait_for_ollama(self, budget=2.0):
+        """Poll the API with backoff until it answers, instead of sleeping a fixed time"""
+        deadline = time.monotonic() + budget
+        delay = 0.02
+        while time.monotonic() < deadline:
+            if self.ollama_api_available(timeout=0.2):
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        return False
+
     def check_ollama_models(self):
+        """List installed Ollama models, memoized until the next pull"""
+        if self._available_models is not None:
+            return self._available_models
+
         available_models = []
+        conn = http.client.HTTPConnection(self.ollama_host, self.ollama_port, timeout=10)
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                output_lines = result.stdout.strip().split("\n")
-                for line in output_lines[1:]:
-                    if line.strip():
-                        parts = line.split()
-                        if parts:
-                            model_name = parts[0]
-                            available_models.append(model_name)
-        except:
+            conn.request("GET", "/api/tags")
+            response = conn.getresponse()
+            if response.status == 200:
+                tags = json.loads(response.read())
+                available_models = [m["name"] for m in tags.get("models", [])]
+                self._available_models = available_models
+        except (OSError, ValueError, KeyError):
             pass
+        finally:
+            conn.close()
         return available_models
 
     def install_ollama_models(self):
@@ -340,28 +592,139 @@ except Exception as e:
         print("Installing missing models...")
         print("This may take a while depending on your internet connection.")
 
-        for model in missing_models:
-            print(f"\nPulling {model}...")
-            try:
-                result = subprocess.run(
-                    ["ollama", "pull", model],
-                    capture_output=False,
-                    timeout=3600
-                )
-                if result.returncode == 0:
-                    self.print_success(f"{model} installed")
-                else:
-                    self.print_error(f"Failed to pull {model}")
-                    print(f"Try manually: ollama pull {model}")
-            except subprocess.TimeoutExpired:
-                self.print_error(f"Timeout while pulling {model}")
-                print(f"Try manually: ollama pull {model}")
-            except Exception as e:
-                self.print_error(f"Error pulling {model}: {e}")
-                print(f"Try manually: ollama pull {model}")
+        # Pull through the local API when it answers: no CLI process per model,
+        # and the server downloads all missing models concurrently
+        if self.ollama_api_available():
+            with ThreadPoolExecutor(max_workers=len(missing_models)) as pool:
+                list(pool.map(self._pull_via_api, missing_models))
+        else:
+            for model in missing_models:
+                self._pull_via_cli(model)
 
+        self._available_models = None
         return True
 
+    def ollama_api_available(self, timeout=2):
+        conn = http.client.HTTPConnection(self.ollama_host, self.ollama_port, timeout=timeout)
+        try:
+            conn.request("GET", "/api/version")
+            response = conn.getresponse()
+            response.read()
+            return response.status == 200
+        except OSError:
+            return False
+        finally:
+            conn.close()
+
+    def _pull_via_api(self, model):
+        print(f"\nPulling {model}...")
+        conn = http.client.HTTPConnection(self.ollama_host, self.ollama_port, timeout=3600)
+        try:
+            conn.request(
+                "POST",
+                "/api/pull",
+                body=json.dumps({"name": model, "stream": True}),
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            if response.status != 200:
+                self.print_error(f"Failed to pull {model}: HTTP {response.status}")
+                print(f"Try manually: ollama pull {model}")
+                return False
+
+            last_status = None
+            for line in response:
+                if not line.strip():
+                    continue
+                progress = json.loads(line)
+                if "error" in progress:
+                    self._clear_pull_progress(model)
+                    self.print_error(f"Failed to pull {model}: {progress['error']}")
+                    print(f"Try manually: ollama pull {model}")
+                    return False
+                status = progress.get("status")
+                if status != last_status:
+                    self._clear_pull_progress(model)
+                    print(f"  [{model}] {status}")
+                    last_status = status
+                if progress.get("total"):
+                    self._update_pull_progress(model, progress.get("completed", 0), progress["total"])
+            self._clear_pull_progress(model)
+
+            if last_status == "success":
+                self.print_success(f"{model} installed")
+                return True
+            self.print_error(f"Failed to pull {model}")
+            print(f"Try manually: ollama pull {model}")
+            return False
+        except Exception as e:
+            self._clear_pull_progress(model)
+            self.print_error(f"Error pulling {model}: {e}")
+            print(f"Try manually: ollama pull {model}")
+            return False
+        finally:
+            conn.close()
+
+    def _update_pull_progress(self, model, completed, total):
+        """Record download progress and redraw the shared progress line at most 10 times a second"""
+        with self._progress_lock:
+            self._pull_progress[model] = (completed, total)
+            now = time.monotonic()
+            if now - self._last_render < 0.1:
+                return
+            self._last_render = now
+            self._write_progress_line()
+
+    def _clear_pull_progress(self, model):
+        """Drop a model from the progress line and erase it so a normal print can follow"""
+        with self._progress_lock:
+            self._pull_progress.pop(model, None)
+            self._last_render = 0.0
+            self._write_progress_line("")
+
+    def _write_progress_line(self, text=None):
+        # Redraws one terminal line in place; lock must be held
+        if not sys.stdout.isatty():
+            return
+        if text is None:
+            parts = [
+                f"{model} {completed * 100 // total}%"
+                for model, (completed, total) in self._pull_progress.items()
+            ]
+            text = f"  Downloading: {' | '.join(parts)}"
+        if self.system == "Windows":
+            # conhost without VT processing prints escape codes literally, so
+            # blank out the previous line with spaces instead of ESC[K
+            line = "\r" + " " * self._progress_width + "\r" + text
+            self._progress_width = len(text)
+        else:
+            line = "\r\x1b[K" + text
+        # Flush pending text first, then bypass the text codec for the redraw
+        sys.stdout.flush()
+        sys.stdout.buffer.write(line.encode())
+        sys.stdout.buffer.flush()
+
+    def _pull_via_cli(self, model):
+        print(f"\nPulling {model}...")
+        try:
+            result = self.run_logged(
+                ["ollama", "pull", model],
+                timeout=3600
+            )
+            if result.returncode == 0:
+                self.print_success(f"{model} installed")
+                return True
+            else:
+                self.print_error(f"Failed to pull {model}")
+                print(f"Try manually: ollama pull {model}")
+        except subprocess.TimeoutExpired:
+            self.print_error(f"Timeout while pulling {model}")
+            print(f"Try manually: ollama pull {model}")
+        except Exception as e:
+            self.print_error(f"Error pulling {model}: {e}")
+            print(f"Try manually: ollama pull {model}")
+        return False
+
     def troubleshoot(self):
         self.print_step("Running Troubleshooting")
         issues_found = []
@@ -369,10 +732,7 @@ except Exception as e:
         if not self.venv_dir.exists():
             issues_found.append("Virtual environment not created")
 
-        pip_cmd = self.get_pip_command()
-        try:
-            subprocess.run([pip_cmd, "--version"], check=True, capture_output=True)
-        except:
+        if not self.get_pip_script().is_file():
             issues_found.append("pip not working in virtual environment")
 
         if not self.check_ollama_installed():
@@ -398,11 +758,13 @@ except Exception as e:
     def create_run_script(self):
         python_cmd = self.get_python_command()
 
+        # Call the venv interpreter directly: activation only edits PATH, and
+        # exec/no pause leaves no shell process waiting on Raven
         if self.system == "Windows":
-            script_content = f"@echo off\ncd /d {self.project_root}\n{python_cmd} raven.py\npause"
+            script_content = f'@echo off\ncd /d "{self.project_root}"\n"{python_cmd}" raven.py %*\n'
             script_path = self.project_root / "run.bat"
         else:
-            script_content = f"#!/bin/bash\ncd {self.project_root}\nsource venv/bin/activate\n{python_cmd} raven.py"
+            script_content = f'#!/bin/bash\ncd "{self.project_root}"\nexec "{python_cmd}" raven.py "$@"\n'
             script_path = self.project_root / "run.sh"
 
         try:
@@ -429,7 +791,7 @@ except Exception as e:
             print(f"   Option B: {python_cmd} raven.py")
         else:
             print("   Option A: ./run.sh")
-            print(f"   Option B: source venv/bin/activate && {python_cmd} raven.py")
+            print(f"   Option B: {python_cmd} raven.py")
 
         print("\n2. VOICE COMMANDS:")
         print("   - Say 'open camera' to activate camera vision")
@@ -450,6 +812,31 @@ except Exception as e:
         print("\n5. FOR MORE HELP:")
         print("   Check README.md for detailed documentation")
 
+    def _buffered(self, output, func):
+        buffer = output.capture()
+        return func(), buffer.getvalue()
+
+    def setup_python_stack(self):
+        if not self.install_requirements():
+            return False
+
+        if not self.download_whisper_model():
+            self.print_warning("Whisper model download failed, but continuing...")
+        if not self.download_token_encoding():
+            self.print_warning("Token encoding download failed, history will use estimated token counts")
+        return True
+
+    def setup_ollama(self):
+        if not self.check_ollama_installed():
+            if not self.install_ollama():
+                self.print_warning("Ollama installation failed. Please install manually.")
+                print("Visit: https://ollama.ai/download")
+        else:
+            if not self.check_ollama_running():
+                self.start_ollama_service()
+
+        return self.install_ollama_models()
+
     def run(self):
         print("\n" + "="*60)
         print("  🦅 R.A.V.E.N. (Reclusive Artificial Vision Enhanced Navigator)")
@@ -465,22 +852,27 @@ except Exception as e:
         if not self.create_virtual_environment():
             return False
 
-        if not self.install_requirements():
+        # The Ollama setup/pulls and the Python requirements + Whisper download
+        # are independent network-bound jobs, so run them side by side. The
+        # first job prints live; the second is buffered and printed after it.
+        # Whisper needs the requirements installed, so those two stay in order.
+        output = ThreadOutput(sys.stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                ollama_job = pool.submit(self.setup_ollama)
+                python_job = pool.submit(self._buffered, output, self.setup_python_stack)
+
+                ollama_job.result()
+                python_ok, python_log = python_job.result()
+        finally:
+            sys.stdout = output._stream
+        sys.stdout.write(python_log)
+        sys.stdout.flush()
+
+        if not python_ok:
             return False
 
-        if not self.download_whisper_model():
-            self.print_warning("Whisper model download failed, but continuing...")
-
-        if not self.check_ollama_installed():
-            if not self.install_ollama():
-                self.print_warning("Ollama installation failed. Please install manually.")
-                print("Visit: https://ollama.ai/download")
-        else:
-            if not self.check_ollama_running():
-                self.start_ollama_service()
-
-        self.install_ollama_models()
-
         self.troubleshoot()
 
         self.create_run_script()
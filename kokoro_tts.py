@@ -6,6 +6,12 @@ Models should be downloaded from the official Kokoro ONNX repository.
 """
 
 import os
+import re
+import mmap
+import queue
+import struct
+import zipfile
+import threading
 import numpy as np
 import sounddevice as sd
 
@@ -16,6 +22,154 @@ except ImportError:
     KOKORO_AVAILABLE = False
     print("Kokoro ONNX not available. TTS will use fallback.")
 
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+# Fastest first; CPU is always kept as the last resort
+PREFERRED_PROVIDERS = (
+    "CUDAExecutionProvider",
+    "CoreMLExecutionProvider",
+    "DmlExecutionProvider",
+    "CPUExecutionProvider",
+)
+
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+PHRASE_SPLIT_RE = re.compile(r'(?<=[,;:])\s+')
+
+def iter_streaming_chunks(texts):
+    """
+    Split a stream of texts into synthesis chunks for pipelined playback.
+    
+    Chunks are sentences, except that the first sentence of the whole
+    stream is cut at its first phrase boundary so playback can start after
+    synthesizing only a few words. Later sentences stay whole, since Kokoro
+    trims the silence around each chunk and splitting at every comma would
+    drop the pauses.
+    
+    Args:
+        texts: Iterable of text, consumed lazily (e.g. a reply arriving
+            sentence by sentence)
+        
+    Yields:
+        Non-empty chunks
+    """
+    first = True
+    for text in texts:
+        for sentence in SENTENCE_SPLIT_RE.split(text):
+            if not sentence.strip():
+                continue
+            if first:
+                first = False
+                yield from PHRASE_SPLIT_RE.split(sentence, maxsplit=1)
+            else:
+                yield sentence
+
+class MappedVoices:
+    """
+    Read-only view of a voices .npz file backed by mmap.
+    
+    Each voice is a zero-copy array over the mapped file, so only the pages
+    of the voices actually used are read from disk. Only uncompressed
+    archives (np.savez) can be mapped; anything else raises ValueError.
+    """
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(self._mm, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+            # Voices are looked up individually, read-ahead only wastes I/O
+            self._mm.madvise(mmap.MADV_RANDOM)
+        
+        self._voices = {}
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{info.filename} is compressed")
+                name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+                self._voices[name] = self._map_member(info)
+    
+    def _map_member(self, info):
+        """Build an array over the .npy data of one archive member."""
+        # The local header repeats the name and has its own extra field
+        name_len, extra_len = struct.unpack_from("<HH", self._mm, info.header_offset + 26)
+        start = info.header_offset + 30 + name_len + extra_len
+        
+        with memoryview(self._mm)[start:start + info.file_size] as member:
+            fmt = np.lib.format
+            reader = _BufferReader(member)
+            version = fmt.read_magic(reader)
+            if version == (1, 0):
+                shape, fortran_order, dtype = fmt.read_array_header_1_0(reader)
+            else:
+                shape, fortran_order, dtype = fmt.read_array_header_2_0(reader)
+        
+        return np.ndarray(
+            shape, dtype=dtype, buffer=self._mm, offset=start + reader.pos,
+            order='F' if fortran_order else 'C'
+        )
+    
+    def __getitem__(self, name):
+        return self._voices[name]
+    
+    def __contains__(self, name):
+        return name in self._voices
+    
+    def __iter__(self):
+        return iter(self._voices)
+    
+    def __len__(self):
+        return len(self._voices)
+    
+    def keys(self):
+        return self._voices.keys()
+
+class _BufferReader:
+    """Minimal file-like reader over a buffer for numpy's header parser."""
+    
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self.pos = 0
+    
+    def read(self, size):
+        data = bytes(self._buffer[self.pos:self.pos + size])
+        self.pos += len(data)
+        return data
+
+def _fallback_tone(sample_rate, duration, frequency=440):
+    """
+    Generate a decaying sine tone.
+    
+    Args:
+        sample_rate: Output sample rate in Hz
+        duration: Length in seconds
+        frequency: Tone frequency in Hz (default: 440, A4)
+        
+    Returns:
+        float32 numpy array of audio samples
+    """
+    n = int(sample_rate * duration)
+    t = np.arange(n, dtype=np.float32) * np.float32(1.0 / sample_rate)
+    
+    # float32 throughout, with t reused as scratch for the envelope
+    audio = np.empty(n, dtype=np.float32)
+    np.multiply(t, np.float32(2 * np.pi * frequency), out=audio)
+    np.sin(audio, out=audio)
+    
+    # Apply envelope for more natural sound
+    np.multiply(t, np.float32(-2.0), out=t)
+    np.exp(t, out=t)
+    t *= np.float32(0.3)
+    audio *= t
+    
+    return audio
+
+FALLBACK_SAMPLE_RATE = 24000
+FALLBACK_MAX_SECONDS = 3.0
+FALLBACK_CLIP = _fallback_tone(FALLBACK_SAMPLE_RATE, FALLBACK_MAX_SECONDS)
+
 class KokoroTTS:
     """
     Kokoro ONNX TTS implementation.
@@ -37,6 +191,8 @@ class KokoroTTS:
         self.sample_rate = 24000
         self.kokoro = None
         self.enabled = False
+        self._warmup = None
+        self._stream = self._open_stream()
         
         if not KOKORO_AVAILABLE:
             print("Kokoro ONNX not available. TTS will use fallback.")
@@ -61,14 +217,91 @@ class KokoroTTS:
             
         try:
             # Initialize Kokoro with the downloaded models
-            self.kokoro = Kokoro(self.model_path, self.voices_path)
+            # Only build a tuned session if Kokoro can take it; otherwise it
+            # would be discarded and the model loaded a second time
+            session = self._create_session() if hasattr(Kokoro, "from_session") else None
+            if session is not None:
+                self.kokoro = Kokoro.from_session(session, self.voices_path)
+            else:
+                self.kokoro = Kokoro(self.model_path, self.voices_path)
+            self._map_voices()
             self.enabled = True
             print(f"Kokoro TTS initialized with model: {self.model_path}")
             
+            # The first inference initializes kernels and faults in the
+            # weights, so pay that cost before the first real utterance
+            self._warmup = threading.Thread(target=self._warm_up, daemon=True)
+            self._warmup.start()
+            
         except Exception as e:
             print(f"Failed to initialize Kokoro TTS: {e}")
             print("TTS will use fallback.")
     
+    def _create_session(self):
+        """
+        Create an ONNX Runtime session with full graph optimizations on the
+        fastest available execution provider.
+        
+        Returns:
+            ort.InferenceSession, or None to let Kokoro use its defaults
+        """
+        if not ORT_AVAILABLE:
+            return None
+        
+        try:
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+            
+            available = set(ort.get_available_providers())
+            providers = [p for p in PREFERRED_PROVIDERS if p in available]
+            session = ort.InferenceSession(
+                self.model_path, sess_options=options, providers=providers
+            )
+            print(f"Kokoro TTS using {session.get_providers()[0]}")
+            return session
+        except Exception as e:
+            print(f"Could not create tuned ONNX session, using defaults: {e}")
+            return None
+    
+    def _map_voices(self):
+        """Swap Kokoro's voice table for an mmap-backed one when possible."""
+        try:
+            self.kokoro.voices = MappedVoices(self.voices_path)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Could not memory-map voices, keeping them in memory: {e}")
+    
+    def _warm_up(self):
+        """Run one throwaway synthesis so later calls hit a hot model."""
+        try:
+            self.kokoro.create("Hi.", voice="af_sky", speed=1.0, lang="en-us")
+        except Exception as e:
+            print(f"Kokoro warm-up failed: {e}")
+    
+    def _open_stream(self):
+        """
+        Open and start the output stream that stays open for the life of
+        this object, so no utterance pays for a PortAudio stream setup.
+        
+        Returns:
+            sd.OutputStream, or None if no output device could be opened
+        """
+        try:
+            # 480 frames is 20 ms at 24 kHz, which bounds the playback tail
+            stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype='float32',
+                blocksize=480,
+                latency='low'
+            )
+            stream.start()
+            return stream
+        except Exception as e:
+            print(f"Could not open audio output stream: {e}")
+            return None
+    
     def synthesize(self, text, voice="af_sky", speed=1.0, lang="en-us"):
         """
         Synthesize speech from text.
@@ -85,6 +318,11 @@ class KokoroTTS:
         if not self.enabled or not self.kokoro:
             return self._fallback_synthesis(text)
         
+        warmup = self._warmup
+        if warmup is not None:
+            warmup.join()
+            self._warmup = None
+        
         try:
             # Generate speech using Kokoro
             samples, sample_rate = self.kokoro.create(text, voice=voice, speed=speed, lang=lang)
@@ -104,18 +342,10 @@ class KokoroTTS:
         Returns:
             numpy array of audio samples
         """
-        # Simple tone generation as fallback
-        duration = min(len(text) * 0.1, 3.0)  # Max 3 seconds
-        frequency = 440  # A4 note
-        
-        t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-        audio = np.sin(frequency * t * 2 * np.pi) * 0.3
-        
-        # Apply envelope for more natural sound
-        envelope = np.exp(-t * 2)
-        audio *= envelope
-        
-        return audio
+        # The fallback tone never changes, so slice the precomputed clip
+        duration = min(len(text) * 0.1, FALLBACK_MAX_SECONDS)
+        n = int(FALLBACK_SAMPLE_RATE * duration)
+        return FALLBACK_CLIP[:n].copy()
     
     def speak(self, text, voice="af_sky", speed=1.0):
         """
@@ -126,14 +356,87 @@ class KokoroTTS:
             voice: Voice to use (default: "af_sky")
             speed: Speech speed (default: 1.0)
         """
+        self.speak_stream([text], voice=voice, speed=speed)
+
+    def speak_stream(self, texts, voice="af_sky", speed=1.0):
+        """
+        Synthesize and play a stream of texts as one utterance.
+        
+        The next chunk is synthesized while the current one plays, across
+        text boundaries too, so sentences handed over while a reply is still
+        generating play back to back.
+        
+        Args:
+            texts: Iterable of text to speak; it may block until the next
+                text is ready
+            voice: Voice to use (default: "af_sky")
+            speed: Speech speed (default: 1.0)
+        """
+        texts = self._echo(texts)
         try:
-            audio = self.synthesize(text, voice=voice, speed=speed)
-            sd.play(audio, self.sample_rate)
-            sd.wait()
-            print(f"RAVEN: {text}")
+            if self._stream is not None:
+                self._speak_pipelined(texts, voice=voice, speed=speed)
+            else:
+                for text in texts:
+                    audio = self.synthesize(text, voice=voice, speed=speed)
+                    sd.play(audio, self.sample_rate)
+                    sd.wait()
         except Exception as e:
             print(f"TTS playback error: {e}")
+
+    @staticmethod
+    def _echo(texts):
+        for text in texts:
             print(f"RAVEN: {text}")
+            yield text
+
+    def _speak_pipelined(self, texts, voice="af_sky", speed=1.0):
+        """
+        Speak chunk by chunk, synthesizing the next chunk while the current
+        one plays.
+        
+        Args:
+            texts: Iterable of text to speak
+            voice: Voice to use (default: "af_sky")
+            speed: Speech speed (default: 1.0)
+        """
+        chunks = queue.Queue(maxsize=2)
+        
+        def produce():
+            try:
+                for piece in iter_streaming_chunks(texts):
+                    chunks.put(self.synthesize(piece, voice=voice, speed=speed))
+            finally:
+                chunks.put(None)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                audio = chunks.get()
+                if audio is None:
+                    break
+                # Blocks until the stream has room, so playback paces the loop
+                self._stream.write(np.ascontiguousarray(audio, dtype=np.float32))
+        finally:
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        """Stop and release the output stream."""
+        stream, self._stream = getattr(self, "_stream", None), None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                print(f"Error closing audio output stream: {e}")
+
+    def __del__(self):
+        self.close()
 
 # Test function
 def test_tts():
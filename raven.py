@@ -1,8 +1,12 @@
 import sys
 import os
+import re
 import time
+import queue
+import threading
+import traceback
+from collections import deque
 import numpy as np
-import whisper
 import speech_recognition as sr
 import ollama
 from PyQt6.QtWidgets import (
@@ -12,17 +16,64 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QLabel,
     QPushButton,
-    QTextEdit,
+    QPlainTextEdit,
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPointF
-from PyQt6.QtGui import QPainter, QColor, QPen, QRadialGradient
+from PyQt6.QtGui import QPainter, QColor, QPen, QPixmap, QRadialGradient
 from camera_overlay import CameraOverlayManager
 
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: sounddevice is installed but the PortAudio library is missing
+    SOUNDDEVICE_AVAILABLE = False
+
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+if not FASTER_WHISPER_AVAILABLE:
+    # openai-whisper drags in torch, so only import it when it is the backend
+    import torch
+    import whisper
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 OLLAMA_MODEL = "llama3.1:8b"
 VISION_MODEL = "qwen2.5vl:7b"
 VISION_MODEL_FALLBACKS = ["qwen2.5vl:7b"]
 WHISPER_SIZE = "medium"
+# CTranslate2 weights prefetched by install.py under models/
+FASTER_WHISPER_DIR = f"faster-whisper-{WHISPER_SIZE}"
 MAX_MEMORY_TOKENS = 4000
+MAX_HISTORY_MESSAGES = 64
+# Frames whose dHash differs in fewer bits than this count as the same scene
+VISION_CACHE_MAX_DISTANCE = 5
+# Unload the chat model before vision (and vice versa) for hosts that cannot
+# hold both; otherwise the chat model stays resident so its prompt cache survives
+LOW_MEMORY = False
+CHAT_KEEP_ALIVE = 120 if LOW_MEMORY else "30m"
+VISION_KEEP_ALIVE = 0 if LOW_MEMORY else None
 SYSTEM_PROMPT = """You are R.A.V.E.N. (Reclusive Artificial Vision Enhanced Navigator), an advanced local AI assistant operating with logical precision and analytical efficiency.
 
 Core operational parameters:
@@ -50,6 +101,155 @@ Response generation standards:
 - If a request contains ambiguity, ask exactly one targeted clarification question.
 - If an action is computationally impossible, state the specific technical limitation and propose the nearest viable alternative solution."""
 
+# Markdown and symbol characters the TTS voice would otherwise read out
+TTS_STRIP_TABLE = str.maketrans("", "", "*`#_~|{}[]<>=^&%$@\\/+")
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Canned intents in priority order: when phrases of several intents occur in
+# one utterance, the earliest intent in this list wins
+INTENT_PATTERNS = [
+    ("camera_status", [
+        "camera status",
+        "is camera open",
+        "camera working",
+        "camera on",
+        "is the camera open",
+        "camera check",
+        "camera state",
+    ]),
+    ("camera_close", [
+        "close camera",
+        "stop camera",
+        "camera close",
+        "camera stop",
+        "close the camera",
+        "stop the camera",
+        "turn off camera",
+    ]),
+    ("camera_open", [
+        "open camera",
+        "start camera",
+        "camera open",
+        "camera start",
+        "open the camera",
+        "start the camera",
+        "camera please",
+    ]),
+    ("vision", [
+        "what are you seeing",
+        "what do you see",
+        "describe what you see",
+        "what can you see",
+        "tell me what you see",
+        "analyze the camera",
+        "describe the camera",
+        "what's in the camera",
+        "camera vision",
+        "describe this",
+        "what is this",
+        "analyze this image",
+        "what's happening",
+        "what's going on",
+        "describe the scene",
+        "tell me about this",
+        "what am i looking at",
+        "what is in front of you",
+    ]),
+    ("greeting", ["hello", "hi raven", "hey raven", "hey", "hi there"]),
+    ("status", [
+        "how are you",
+        "how are you doing",
+        "are you online",
+        "system status",
+        "are you there",
+        "are you awake",
+    ]),
+    ("identity", [
+        "who are you",
+        "what are you",
+        "what is your name",
+        "who made you",
+        "what can you do",
+    ]),
+]
+
+
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_SAMPLES = VAD_SAMPLE_RATE * 20 // 1000
+# Frames of context kept around each voiced frame so word edges survive
+VAD_PADDING_FRAMES = 10
+
+
+def trim_to_speech(pcm, vad):
+    """Keep only the 20 ms frames of 16 kHz int16 PCM that the VAD marks as speech, plus padding."""
+    n_frames = len(pcm) // VAD_FRAME_SAMPLES
+    if n_frames == 0:
+        return pcm
+    frames = pcm[: n_frames * VAD_FRAME_SAMPLES].reshape(n_frames, VAD_FRAME_SAMPLES)
+    voiced = np.fromiter(
+        (vad.is_speech(frame.tobytes(), VAD_SAMPLE_RATE) for frame in frames),
+        dtype=bool,
+        count=n_frames,
+    )
+    window = np.ones(2 * VAD_PADDING_FRAMES + 1)
+    # A full convolution is n_frames + 2 * padding long whatever the input
+    # size; mode="same" would return the window's length for short clips
+    keep = np.convolve(voiced, window)[VAD_PADDING_FRAMES:VAD_PADDING_FRAMES + n_frames] > 0
+    return frames[keep].ravel()
+
+
+def build_intent_matcher(intent_patterns):
+    """Return a function mapping lowercased text to the highest-priority matching intent, or None."""
+    substring_match = _build_substring_matcher(intent_patterns)
+
+    # Utterances that are exactly one phrase ("hey raven") resolve with a
+    # single dict lookup; the value is what the full scan would return, so
+    # priorities are unchanged
+    exact = {
+        phrase: substring_match(phrase)
+        for _, phrases in intent_patterns
+        for phrase in phrases
+    }
+
+    def match(text):
+        # No phrase ends in punctuation, so stripping it cannot change the result
+        intent = exact.get(text.rstrip(".!?,"))
+        return intent if intent is not None else substring_match(text)
+
+    return match
+
+
+def _build_substring_matcher(intent_patterns):
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for priority, (intent, phrases) in enumerate(intent_patterns):
+            for phrase in phrases:
+                # A phrase listed under two intents keeps the higher-priority one
+                if phrase not in automaton:
+                    automaton.add_word(phrase, (priority, intent))
+        automaton.make_automaton()
+
+        def match(text):
+            # One pass over the text finds every phrase of every intent
+            hits = [value for _, value in automaton.iter(text)]
+            return min(hits)[1] if hits else None
+
+        return match
+
+    compiled = [
+        (intent, re.compile("|".join(map(re.escape, phrases))))
+        for intent, phrases in intent_patterns
+    ]
+
+    def match(text):
+        for intent, pattern in compiled:
+            if pattern.search(text):
+                return intent
+        return None
+
+    return match
+
 try:
     from kokoro_tts import KokoroTTS
 except ImportError:
@@ -57,14 +257,11 @@ except ImportError:
         """Fallback TTS implementation."""
 
         def __init__(self):
-            try:
-                import sounddevice as sd
-                import numpy as np
-
-                self.sample_rate = 22050
-                self.enabled = True
-            except Exception:
-                self.enabled = False
+            self.sample_rate = 22050
+            # The tone never changes, so build the longest clip once and slice it
+            t = np.arange(int(self.sample_rate * 3.0), dtype=np.float32) / self.sample_rate
+            self._clip = (np.sin(440 * t * 2 * np.pi) * 0.3 * np.exp(-t * 2)).astype(np.float32)
+            self.enabled = SOUNDDEVICE_AVAILABLE
 
         def speak(self, text):
             """Convert text to speech using fallback method."""
@@ -72,72 +269,102 @@ except ImportError:
                 return
 
             try:
-                import sounddevice as sd
-                import numpy as np
-
                 duration = min(len(text) * 0.1, 3.0)
-                frequency = 440
-                t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-                audio = np.sin(frequency * t * 2 * np.pi) * 0.3
-
-                envelope = np.exp(-t * 2)
-                audio *= envelope
-
-                sd.play(audio, self.sample_rate)
+                n = int(self.sample_rate * duration)
+                sd.play(self._clip[:n], self.sample_rate)
                 sd.wait()
 
             except Exception:
                 self.enabled = False
 
+        def speak_stream(self, texts):
+            """Speak each text in turn."""
+            for text in texts:
+                self.speak(text)
+
 
 class RavenCore:
     def __init__(self, parent_window=None):
         self.tts_engine = KokoroTTS()
-
-        from camera_overlay import CameraOverlayManager
-
         self.camera_manager = CameraOverlayManager()
         self.parent_window = parent_window
-        self._last_vision_model = None
+        self._last_vision = None
 
         models_dir = os.path.join(os.path.dirname(__file__), "models")
-        self.stt_model = whisper.load_model(WHISPER_SIZE, download_root=models_dir)
+        self._stt_warmup = None
+        if FASTER_WHISPER_AVAILABLE:
+            # Load the installer's copy so startup never touches the network;
+            # without it faster-whisper fetches the weights from the hub
+            model_path = os.path.join(models_dir, FASTER_WHISPER_DIR)
+            if not os.path.isfile(os.path.join(model_path, "model.bin")):
+                model_path = WHISPER_SIZE
+            # int8 weights run several times faster than openai-whisper; a
+            # CUDA host keeps float16 activations, as whisper.load_model did
+            if ctranslate2.get_cuda_device_count() > 0:
+                device, compute_type = "cuda", "int8_float16"
+            else:
+                device, compute_type = "cpu", "int8"
+            self.stt_model = WhisperModel(
+                model_path, device=device, compute_type=compute_type, download_root=models_dir
+            )
+        else:
+            self.stt_model = whisper.load_model(WHISPER_SIZE, download_root=models_dir)
+            self._stt_warmup = threading.Thread(target=self._compile_whisper, daemon=True)
+            self._stt_warmup.start()
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 1000
         self.recognizer.dynamic_energy_threshold = True
+        self._mic = None
+        # faster-whisper has its own VAD filter; openai-whisper gets webrtcvad
+        self._vad = (
+            webrtcvad.Vad(2) if WEBRTCVAD_AVAILABLE and not FASTER_WHISPER_AVAILABLE else None
+        )
 
-        self.history = [{"role": "system", "content": SYSTEM_PROMPT}]
+        # The system prompt is kept out of the history so pruning can pop
+        # the oldest turn from the left in O(1)
+        self._token_encoding = self._load_token_encoding()
+        self._system_message = {"role": "system", "content": SYSTEM_PROMPT}
+        self._system_tokens = self._count_tokens(SYSTEM_PROMPT)
+        self.history = deque(maxlen=MAX_HISTORY_MESSAGES)
+        self._history_token_counts = deque(maxlen=MAX_HISTORY_MESSAGES)
+        self._history_tokens = 0
+        self._match_intent = build_intent_matcher(INTENT_PATTERNS)
+        self._intent_handlers = {
+            "camera_status": self._intent_camera_status,
+            "camera_close": self._intent_camera_close,
+            "camera_open": self._intent_camera_open,
+            "vision": self._intent_vision,
+            "greeting": self._intent_greeting,
+            "status": self._intent_status,
+            "identity": self._intent_identity,
+        }
 
     def unload_model(self, model_name):
         """Force unload a model from memory to free resources."""
+        # With no prompt Ollama only expires the runner; sending one would
+        # load an idle model just to drop it again
         try:
-            ollama.generate(model=model_name, prompt=" ", keep_alive=0)
+            ollama.generate(model=model_name, keep_alive=0)
             return
         except Exception:
             pass
 
         try:
-            ollama.chat(
-                model=model_name,
-                messages=[{"role": "user", "content": " "}],
-                keep_alive=0,
-            )
+            ollama.chat(model=model_name, messages=[], keep_alive=0)
         except Exception:
             pass
 
-    def analyze_camera_frame(self, user_question):
+    def analyze_camera_frame(self, user_question, on_sentence=None):
         """Analyze the current camera frame using advanced vision models with detailed descriptions"""
         try:
-            self.unload_model(OLLAMA_MODEL)
-            time.sleep(0.25)
-
-            base64_image = self.camera_manager.capture_and_analyze_frame()
-            if not base64_image:
-                return "Unable to capture frame from camera. Please make sure the camera is working."
+            # Encode and hash the frame on the overlay's encoder thread while
+            # the prompt is built and the chat model is unloaded
+            frame_future = self.camera_manager.capture_frame_async(format="bytes", with_hash=True)
 
+            question_lower = user_question.lower()
             if (
-                "what are you seeing" in user_question.lower()
-                or "what do you see" in user_question.lower()
+                "what are you seeing" in question_lower
+                or "what do you see" in question_lower
             ):
                 vision_prompt = f"""Please provide a detailed description of what you see in this image. 
                 Include:
@@ -151,9 +378,26 @@ class RavenCore:
             else:
                 vision_prompt = f"Analyze this image and describe what you see. User asked: {user_question}"
 
+            # Runs while the frame encodes, so it happens even on a cache hit
+            # below; Ollama itself waits for memory before loading vision
+            if LOW_MEMORY:
+                self.unload_model(OLLAMA_MODEL)
+
+            captured = frame_future.result() if frame_future is not None else None
+            if not captured:
+                return "Unable to capture frame from camera. Please make sure the camera is working."
+            jpeg_image, frame_hash = captured
+
+            # Same question about an unchanged scene: reuse the last answer
+            if self._last_vision is not None:
+                last_prompt, last_hash, last_response = self._last_vision
+                distance = bin(frame_hash ^ last_hash).count("1")
+                if last_prompt == vision_prompt and distance < VISION_CACHE_MAX_DISTANCE:
+                    return last_response
+
             try:
                 messages = [
-                    {"role": "user", "content": vision_prompt, "images": [base64_image]}
+                    {"role": "user", "content": vision_prompt, "images": [jpeg_image]}
                 ]
 
                 vision_options = {
@@ -162,7 +406,6 @@ class RavenCore:
                     "top_k": 50,
                     "top_p": 0.95,
                     "num_ctx": 2048,
-                    "keep_alive": 0,
                 }
 
                 candidates = [VISION_MODEL] + [
@@ -170,15 +413,17 @@ class RavenCore:
                 ]
                 last_error = None
                 analysis = None
-                used_model = None
 
                 for model_name in candidates:
                     try:
-                        response = ollama.chat(
-                            model=model_name, messages=messages, options=vision_options
+                        analysis = self._stream_chat(
+                            model_name,
+                            messages,
+                            vision_options,
+                            keep_alive=VISION_KEEP_ALIVE,
+                            on_sentence=on_sentence,
+                            prefix="Based on what I can see: ",
                         )
-                        analysis = response["message"]["content"]
-                        used_model = model_name
                         break
                     except Exception as e:
                         last_error = e
@@ -198,10 +443,11 @@ class RavenCore:
                         else RuntimeError("No vision model available")
                     )
 
-                base64_image = None
-                self._last_vision_model = used_model
+                jpeg_image = None
 
-                return f"Based on what I can see: {analysis}"
+                response = f"Based on what I can see: {analysis}"
+                self._last_vision = (vision_prompt, frame_hash, response)
+                return response
 
             except Exception:
                 fallback_response = ollama.chat(
@@ -217,26 +463,59 @@ class RavenCore:
                         "num_predict": 100,
                         "top_k": 40,
                         "top_p": 0.9,
-                        "keep_alive": 120,
                     },
+                    keep_alive=CHAT_KEEP_ALIVE,
+                )
+                return self._fail(
+                    f"Vision model could not run with available memory. {fallback_response['message']['content']}",
+                    on_sentence,
                 )
-                return f"Vision model could not run with available memory. {fallback_response['message']['content']}"
 
         except Exception as e:
-            return f"Error analyzing camera frame: {str(e)}"
-        finally:
-            import gc
-
-            gc.collect()
+            return self._fail(f"Error analyzing camera frame: {str(e)}", on_sentence)
 
     def listen(self):
         """Listen for audio and return raw audio data."""
-        with sr.Microphone(sample_rate=16000) as source:
-            try:
-                audio = self.recognizer.listen(source, timeout=15, phrase_time_limit=30)
-                return audio
-            except sr.WaitTimeoutError:
-                return None
+        # The microphone stays open between utterances instead of
+        # reopening the PortAudio stream for every listen
+        if self._mic is None:
+            mic = sr.Microphone(sample_rate=16000)
+            mic.__enter__()
+            self._mic = mic
+        try:
+            audio = self.recognizer.listen(self._mic, timeout=15, phrase_time_limit=30)
+            return audio
+        except sr.WaitTimeoutError:
+            return None
+
+    def close(self):
+        """Release the microphone and unload the chat model."""
+        mic, self._mic = self._mic, None
+        if mic is not None:
+            mic.__exit__(None, None, None)
+
+        self.unload_model(OLLAMA_MODEL)
+
+    def _compile_whisper(self):
+        """Compile the openai-whisper encoder and warm it up on a second of silence.
+
+        The encoder always sees a 30 s mel window, so it compiles once; the
+        decoder's growing KV cache would recompile every step and is left eager.
+        """
+        if not hasattr(torch, "compile"):
+            return
+        encoder = self.stt_model.encoder
+        eager_forward = encoder.forward
+        # CUDA graphs only exist on the GPU
+        on_gpu = next(encoder.parameters()).is_cuda
+        try:
+            encoder.forward = torch.compile(
+                eager_forward, mode="reduce-overhead" if on_gpu else None
+            )
+            self.stt_model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, language="en")
+        except Exception as e:
+            print(f"Whisper encoder compile failed, staying eager: {e}")
+            encoder.forward = eager_forward
 
     def transcribe(self, audio_data):
         """Transcribe audio using local Whisper model."""
@@ -244,208 +523,197 @@ class RavenCore:
             return ""
 
         try:
-            wav_bytes = audio_data.get_raw_data(convert_rate=16000, convert_width=2)
-            audio_np = (
-                np.frombuffer(wav_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-            )
+            # The microphone already records 16 kHz 16-bit, so no conversion
+            wav_bytes = audio_data.get_raw_data()
+            # Cast and scale in a single pass into one float32 buffer
+            pcm = np.frombuffer(wav_bytes, dtype=np.int16)
+            if self._vad is not None:
+                # Encoder cost grows with input length, so drop the silence first
+                pcm = trim_to_speech(pcm, self._vad)
+                if pcm.size == 0:
+                    return ""
+            audio_np = np.empty(pcm.shape, dtype=np.float32)
+            np.multiply(pcm, np.float32(1.0 / 32768.0), out=audio_np)
+            if FASTER_WHISPER_AVAILABLE:
+                # The VAD filter drops silent stretches before the encoder sees them
+                segments, _ = self.stt_model.transcribe(
+                    audio_np, language="en", beam_size=1, vad_filter=True
+                )
+                return "".join(segment.text for segment in segments).strip()
+            warmup = self._stt_warmup
+            if warmup is not None:
+                warmup.join()
+                self._stt_warmup = None
             result = self.stt_model.transcribe(audio_np, fp16=False, language="en")
             text = result["text"].strip()
             return text
         except Exception:
             return ""
 
-    def think(self, user_text):
-        """Process text with Ollama."""
-        user_text_lower = user_text.lower().strip()
+    def think(self, user_text, on_sentence=None):
+        """Process text with Ollama.
 
-        camera_status_patterns = [
-            "camera status",
-            "is camera open",
-            "camera working",
-            "camera on",
-            "is the camera open",
-            "camera check",
-            "camera state",
-        ]
-
-        camera_close_patterns = [
-            "close camera",
-            "stop camera",
-            "camera close",
-            "camera stop",
-            "close the camera",
-            "stop the camera",
-            "turn off camera",
-        ]
-
-        camera_open_patterns = [
-            "open camera",
-            "start camera",
-            "camera open",
-            "camera start",
-            "open the camera",
-            "start the camera",
-            "camera please",
-        ]
-
-        vision_patterns = [
-            "what are you seeing",
-            "what do you see",
-            "describe what you see",
-            "what can you see",
-            "tell me what you see",
-            "analyze the camera",
-            "describe the camera",
-            "what's in the camera",
-            "camera vision",
-            "describe this",
-            "what is this",
-            "analyze this image",
-            "what's happening",
-            "what's going on",
-            "describe the scene",
-            "tell me about this",
-            "what am i looking at",
-            "what is in front of you",
-        ]
-
-        basic_greeting_patterns = ["hello", "hi raven", "hey raven", "hey", "hi there"]
-
-        status_patterns = [
-            "how are you",
-            "how are you doing",
-            "are you online",
-            "system status",
-            "are you there",
-            "are you awake",
-        ]
-
-        identity_patterns = [
-            "who are you",
-            "what are you",
-            "what is your name",
-            "who made you",
-            "what can you do",
-        ]
-
-        if any(phrase in user_text_lower for phrase in camera_status_patterns):
-            is_open = self.camera_manager.is_camera_open()
-            status = "open" if is_open else "closed"
-            response = f"Camera is currently {status}."
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
+        When on_sentence is given, the reply is also passed to it one sentence
+        at a time while the model is still generating, so speech can start
+        before the full reply exists.
+        """
+        if on_sentence is None:
+            return self._respond(user_text, None)
 
-        elif any(phrase in user_text_lower for phrase in camera_close_patterns):
-            result = self.camera_manager.close_camera()
-            response = f"Camera functionality deactivated. {result}"
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
+        spoken = False
 
-        elif any(phrase in user_text_lower for phrase in camera_open_patterns):
-            result = self.camera_manager.open_camera(self.parent_window)
-            if self.parent_window and self.camera_manager.is_overlay_open():
-                self.camera_manager.position_overlay(self.parent_window)
-            response = f"Camera functionality activated. {result}"
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
+        def emit(sentence):
+            nonlocal spoken
+            spoken = True
+            on_sentence(sentence)
 
-        elif any(phrase in user_text_lower for phrase in vision_patterns):
-            if not self.camera_manager.is_camera_open():
-                response = "Please open the camera first by saying 'open camera'."
-                self.history.append({"role": "user", "content": user_text})
-                self.history.append({"role": "assistant", "content": response})
-                return response
-
-            response = self.analyze_camera_frame(user_text)
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
+        response = self._respond(user_text, emit)
+        if not spoken:
+            on_sentence(response)
+        return response
 
-        elif any(phrase in user_text_lower for phrase in basic_greeting_patterns):
-            response = "Online and ready, sir."
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
-
-        elif any(phrase in user_text_lower for phrase in status_patterns):
-            response = "All systems are stable and standing by."
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
-            return response
+    def _respond(self, user_text, on_sentence):
+        user_text_lower = user_text.lower().strip()
 
-        elif any(phrase in user_text_lower for phrase in identity_patterns):
-            response = (
-                "I am R.A.V.E.N. (Reclusive Artificial Vision Enhanced Navigator), your local AI assistant."
-            )
-            self.history.append({"role": "user", "content": user_text})
-            self.history.append({"role": "assistant", "content": response})
+        intent = self._match_intent(user_text_lower)
+        if intent is not None:
+            response = self._intent_handlers[intent](user_text, on_sentence)
+            self._remember("user", user_text)
+            self._remember("assistant", response)
             return response
 
-        self.history.append({"role": "user", "content": user_text})
+        self._remember("user", user_text)
         self._prune_memory()
 
         try:
-            if self.camera_manager.is_overlay_open():
-                self.unload_model(self._last_vision_model or VISION_MODEL)
-
-            response = ollama.chat(
-                model=OLLAMA_MODEL,
-                messages=self.history,
-                options={
+            ai_text = self._stream_chat(
+                OLLAMA_MODEL,
+                [self._system_message, *self.history],
+                {
                     "temperature": 0.7,
                     "num_predict": 200,
                     "top_k": 40,
                     "top_p": 0.9,
-                    "keep_alive": 120,
                 },
+                keep_alive=CHAT_KEEP_ALIVE,
+                on_sentence=on_sentence,
             )
-            ai_text = response["message"]["content"]
-            self.history.append({"role": "assistant", "content": ai_text})
+            self._remember("assistant", ai_text)
             return ai_text
         except Exception as e:
-            return f"Error connecting to neural core: {e}"
+            return self._fail(f"Error connecting to neural core: {e}", on_sentence)
+
+    def _fail(self, message, on_sentence):
+        """Return an error reply, speaking it even if a failed stream already spoke part of an answer."""
+        if on_sentence is not None:
+            on_sentence(message)
+        return message
+
+    def _stream_chat(self, model, messages, options, keep_alive=None, on_sentence=None, prefix=""):
+        """Stream a chat reply, passing each completed sentence to on_sentence as it arrives."""
+        parts = []
+        pending = prefix
+        stream = ollama.chat(
+            model=model, messages=messages, options=options, keep_alive=keep_alive, stream=True
+        )
+        for chunk in stream:
+            content = chunk["message"]["content"]
+            parts.append(content)
+            if on_sentence is None:
+                continue
+            pending += content
+            *sentences, pending = SENTENCE_END_RE.split(pending)
+            for sentence in sentences:
+                on_sentence(sentence)
+        if on_sentence is not None and pending.strip():
+            on_sentence(pending)
+        return "".join(parts)
+
+    def _intent_camera_status(self, user_text, on_sentence):
+        status = "open" if self.camera_manager.is_camera_open() else "closed"
+        return f"Camera is currently {status}."
+
+    def _intent_camera_close(self, user_text, on_sentence):
+        result = self.camera_manager.close_camera()
+        return f"Camera functionality deactivated. {result}"
+
+    def _intent_camera_open(self, user_text, on_sentence):
+        result = self.camera_manager.open_camera(self.parent_window)
+        if self.parent_window and self.camera_manager.is_overlay_open():
+            self.camera_manager.position_overlay(self.parent_window)
+        return f"Camera functionality activated. {result}"
+
+    def _intent_vision(self, user_text, on_sentence):
+        if not self.camera_manager.is_camera_open():
+            return "Please open the camera first by saying 'open camera'."
+        return self.analyze_camera_frame(user_text, on_sentence)
+
+    def _intent_greeting(self, user_text, on_sentence):
+        return "Online and ready, sir."
+
+    def _intent_status(self, user_text, on_sentence):
+        return "All systems are stable and standing by."
+
+    def _intent_identity(self, user_text, on_sentence):
+        return "I am R.A.V.E.N. (Reclusive Artificial Vision Enhanced Navigator), your local AI assistant."
+
+    def _load_token_encoding(self):
+        """cl100k_base approximates the chat model's tokenizer far better than chars / 4.
+
+        The BPE file comes from models/tiktoken, where install.py saves it.
+        Without it, counting falls back to chars / 4 instead of downloading
+        at startup.
+        """
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        cache_dir = os.path.join(os.path.dirname(__file__), "models", "tiktoken")
+        if not os.path.isdir(cache_dir) or not os.listdir(cache_dir):
+            return None
+        os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+    def _count_tokens(self, text):
+        if self._token_encoding is None:
+            return len(text) // 4 + 1
+        return len(self._token_encoding.encode(text, disallowed_special=()))
+
+    def _remember(self, role, content):
+        """Append a message to the history along with its token count."""
+        tokens = self._count_tokens(content)
+        if len(self.history) == self.history.maxlen:
+            # Both deques drop their oldest entry on this append
+            self._history_tokens -= self._history_token_counts[0]
+        self.history.append({"role": role, "content": content})
+        self._history_token_counts.append(tokens)
+        self._history_tokens += tokens
 
     def _prune_memory(self):
-        """Keep memory within limits (rough estimation)."""
-        total_chars = sum(len(m["content"]) for m in self.history)
-        while total_chars > MAX_MEMORY_TOKENS * 4 and len(self.history) > 1:
-            removed = self.history.pop(1)
-            total_chars -= len(removed["content"])
+        """Drop the oldest turns until the prompt fits in MAX_MEMORY_TOKENS."""
+        while (
+            self._system_tokens + self._history_tokens > MAX_MEMORY_TOKENS
+            and len(self.history) > 1
+        ):
+            self.history.popleft()
+            self._history_tokens -= self._history_token_counts.popleft()
 
     def _clean_text_for_tts(self, text):
-        import re
-        text = re.sub(r'\*+', '', text)
-        text = re.sub(r'`+', '', text)
-        text = re.sub(r'#+', '', text)
-        text = re.sub(r'_+', '', text)
-        text = re.sub(r'~+', '', text)
-        text = re.sub(r'\|+', '', text)
-        text = re.sub(r'\{+', '', text)
-        text = re.sub(r'\}+', '', text)
-        text = re.sub(r'\[+', '', text)
-        text = re.sub(r'\]+', '', text)
-        text = re.sub(r'<+', '', text)
-        text = re.sub(r'>+', '', text)
-        text = re.sub(r'=+', '', text)
-        text = re.sub(r'\^+', '', text)
-        text = re.sub(r'&+', '', text)
-        text = re.sub(r'%+', '', text)
-        text = re.sub(r'\$+', '', text)
-        text = re.sub(r'@+', '', text)
-        text = re.sub(r'\\+', '', text)
-        text = re.sub(r'\/+', '', text)
-        text = re.sub(r'\++', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        text = text.translate(TTS_STRIP_TABLE)
+        return WHITESPACE_RE.sub(' ', text).strip()
 
     def speak(self, text):
         """Speak text using TTS."""
         cleaned_text = self._clean_text_for_tts(text)
         self.tts_engine.speak(cleaned_text)
 
+    def speak_stream(self, sentences):
+        """Speak sentences as they arrive, as one continuous utterance."""
+        self.tts_engine.speak_stream(
+            self._clean_text_for_tts(sentence) for sentence in sentences
+        )
+
 
 class AssistantThread(QThread):
     status_signal = pyqtSignal(str)
@@ -456,9 +724,30 @@ class AssistantThread(QThread):
         super().__init__()
         self.core = core
         self.running = True
+        # Each reply is queued as its own sentence queue, ended by None, so
+        # the whole reply streams through one TTS pipeline
+        self._speech = queue.Queue()
+        self._reply = None
+
+    def _speech_worker(self):
+        """Speak queued replies in order while each reply is still generating."""
+        while True:
+            reply = self._speech.get()
+            try:
+                if reply is None:
+                    return
+                self.core.speak_stream(iter(reply.get, None))
+            finally:
+                self._speech.task_done()
+
+    def _queue_speech(self, sentence):
+        self.status_signal.emit("Speaking...")
+        self._reply.put(sentence)
 
     def run(self):
         self.status_signal.emit("System Online. Waiting for input...")
+        speaker = threading.Thread(target=self._speech_worker, daemon=True)
+        speaker.start()
 
         while self.running:
             try:
@@ -476,86 +765,129 @@ class AssistantThread(QThread):
 
                 self.chat_signal.emit("user", text)
 
-                if "goodbye" in text.lower() or "shutdown" in text.lower():
+                text_lower = text.lower()
+                if "goodbye" in text_lower or "shutdown" in text_lower:
                     self.status_signal.emit("Shutting down...")
                     self.core.speak("Goodbye, sir.")
                     self.running = False
                     break
 
                 self.status_signal.emit("Analyzing...")
-                response = self.core.think(text)
+                self._reply = queue.Queue()
+                self._speech.put(self._reply)
+                try:
+                    response = self.core.think(text, on_sentence=self._queue_speech)
+                finally:
+                    self._reply.put(None)
                 self.chat_signal.emit("raven", response)
 
-                self.status_signal.emit("Speaking...")
-                self.core.speak(response)
-
+                # Finish speaking before listening again
+                self._speech.join()
                 self.status_signal.emit("Standing by...")
 
             except Exception as e:
                 error_msg = f"Error in processing loop: {str(e)}"
-                import traceback
                 traceback.print_exc()
                 self.status_signal.emit(f"Error in processing loop: {str(e)}")
                 self.chat_signal.emit("system", error_msg)
                 time.sleep(1)
 
+        self._speech.put(None)
+        speaker.join()
+        self.core.close()
+
     def stop(self):
         self.running = False
 
 
 class ArcReactorWidget(QWidget):
+    STATE_COLORS = {
+        "listening": (0, 255, 100),
+        "speaking": (0, 100, 255),
+        "processing": (255, 100, 0),
+    }
+    IDLE_COLOR = (0, 255, 255)
+    FRAME_INTERVAL_MS = 33
+    # Pulse units per millisecond, the same speed as the original 2 per 50 ms tick
+    PULSE_RATE = 2 / 50
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(200, 200)
         self.color = QColor(0, 255, 255)
         self.pulse_timer = QTimer(self)
         self.pulse_timer.timeout.connect(self.update_pulse)
-        self.pulse_timer.start(50)
+        self.pulse_timer.start(self.FRAME_INTERVAL_MS)
         self.pulse_value = 0
         self.pulse_direction = 1
         self.state = "idle"
+        # Ring and core only change with state or size, so they are rendered
+        # once into a pixmap and only the glow is drawn every frame
+        self._ring_cache = {}
 
     def set_state(self, state):
         self.state = state
         self.update()
 
     def update_pulse(self):
-        self.pulse_value += self.pulse_direction * 2
+        self.pulse_value += self.pulse_direction * self.PULSE_RATE * self.FRAME_INTERVAL_MS
         if self.pulse_value > 50:
             self.pulse_direction = -1
         elif self.pulse_value < 0:
             self.pulse_direction = 1
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def resizeEvent(self, event):
+        self._ring_cache.clear()
+        super().resizeEvent(event)
 
+    def _geometry(self):
         center = QPointF(self.rect().center())
         radius = min(self.width(), self.height()) / 2 - 20
+        return center, radius
 
-        if self.state == "listening":
-            base_color = QColor(0, 255, 100)
-            pulse_speed = 5
-        elif self.state == "speaking":
-            base_color = QColor(0, 100, 255)
-            pulse_speed = 8
-        elif self.state == "processing":
-            base_color = QColor(255, 100, 0)
-            pulse_speed = 2
-        else:
-            base_color = QColor(0, 255, 255)
-            pulse_speed = 1
+    def _ring_pixmap(self, base_color):
+        pixmap = self._ring_cache.get(self.state)
+        if pixmap is not None:
+            return pixmap
 
-        glow_alpha = 100 + self.pulse_value * 2
-        glow_color = QColor(base_color)
-        glow_color.setAlpha(min(255, max(0, glow_alpha)))
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        center, radius = self._geometry()
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         pen = QPen(base_color)
         pen.setWidth(4)
         painter.setPen(pen)
         painter.drawEllipse(center, radius, radius)
 
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(base_color)
+        core_radius = radius * 0.3
+        painter.drawEllipse(center, core_radius, core_radius)
+        painter.end()
+
+        self._ring_cache[self.state] = pixmap
+        return pixmap
+
+    def paintEvent(self, event):
+        base_color = QColor(*self.STATE_COLORS.get(self.state, self.IDLE_COLOR))
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._ring_pixmap(base_color))
+
+        # The glow is the base color, so drawing it over the cached ring and
+        # core leaves them unchanged, as when it was drawn between them
+        center, radius = self._geometry()
+        glow_alpha = int(100 + self.pulse_value * 2)
+        glow_color = QColor(base_color)
+        glow_color.setAlpha(min(255, max(0, glow_alpha)))
+
         gradient = QRadialGradient(center, radius)
         gradient.setColorAt(0, glow_color)
         gradient.setColorAt(1, Qt.GlobalColor.transparent)
@@ -563,10 +895,6 @@ class ArcReactorWidget(QWidget):
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawEllipse(center, radius, radius)
 
-        painter.setBrush(base_color)
-        core_radius = radius * 0.3
-        painter.drawEllipse(center, core_radius, core_radius)
-
 
 class RavenWindow(QMainWindow):
     def __init__(self):
@@ -579,7 +907,7 @@ class RavenWindow(QMainWindow):
                 background-color: #0d0d0d; 
             }
             QLabel { color: #00FFFF; font-family: 'Segoe UI', sans-serif; font-size: 14px; }
-            QTextEdit { 
+            QPlainTextEdit { 
                 background-color: #151515; 
                 color: #00E0E0; 
                 border: 1px solid #004444; 
@@ -624,8 +952,11 @@ class RavenWindow(QMainWindow):
         )
         layout.addWidget(self.status_label)
 
-        self.chat_log = QTextEdit()
+        # Plain text edit appends a block without relayouting the whole
+        # document, and the block cap bounds the scrollback
+        self.chat_log = QPlainTextEdit()
         self.chat_log.setReadOnly(True)
+        self.chat_log.setMaximumBlockCount(500)
         layout.addWidget(self.chat_log)
 
         self.toggle_btn = QPushButton("INITIATE PROTOCOL")
@@ -699,14 +1030,14 @@ class RavenWindow(QMainWindow):
             color = "#00FFFF"
             prefix = "RAVEN"
 
-        self.chat_log.append(
+        # appendHtml keeps following the end only while the view is already
+        # at the bottom, so scrolling back through history is not interrupted
+        self.chat_log.appendHtml(
             f'<span style="color:{color}"><b>{prefix}:</b> {text}</span><br>'
         )
-        sb = self.chat_log.verticalScrollBar()
-        sb.setValue(sb.maximum())
 
     def log(self, text):
-        self.chat_log.append(f'<span style="color:#555"><i>{text}</i></span>')
+        self.chat_log.appendHtml(f'<span style="color:#555"><i>{text}</i></span>')
 
     def on_thread_finished(self):
         self.is_running = False
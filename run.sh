@@ -1,2 +1,3 @@
 #!/bin/bash
-/home/ceon/projects/raven/venv/bin/python raven.py
\ No newline at end of file
+cd "$(dirname "$0")"
+exec venv/bin/python raven.py "$@"